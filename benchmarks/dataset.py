@@ -0,0 +1,113 @@
+# Синтетические данные для нагрузочных тестов: N пользователей, M заявок, K записей аудит-лога.
+# Генерация детерминирована (--seed), пишет пачками через executemany в SQLite или PostgreSQL
+# Запуск: python benchmarks/dataset.py --db-url sqlite:////tmp/bench.db [--users 1000] [--applications 20000] [--logs 100000]
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_NAMES = ["Анна", "Иван", "Мария", "Петр", "Ольга", "Сергей", "Елена", "Дмитрий", "Наталья", "Алексей"]
+LAST_NAMES = ["Иванов", "Петрова", "Сидоров", "Кузнецова", "Смирнов", "Попова", "Волков", "Соколова", "Лебедев", "Новикова"]
+POSITIONS = ["инженер", "бухгалтер", "менеджер", "аналитик", "юрист", "дизайнер"]
+DEPARTMENTS = ["ИТ", "Бухгалтерия", "Продажи", "Юридический отдел", "Маркетинг", "Кадры", "Логистика", "Производство"]
+APP_TYPES = ["ежегодный основной оплачиваемый", "ежегодный дополнительный оплачиваемый",
+             "без сохранения заработной платы", "больничный"]
+STATUSES = ["одобрена", "одобрена", "одобрена", "отклонена", "на рассмотрении"]
+ACTIONS = ["Создана заявка", "Одобрена заявка", "Отклонена заявка", "Регистрация", "Запрошен отчет"]
+# Пользователи набора не пересекаются с чатами сценариев (см. e2e.py)
+FIRST_USER_ID = 10_000_000
+BATCH_SIZE = 5000
+
+
+def batches(rows, size=BATCH_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def user_rows(count):
+    for i in range(count):
+        user_id = FIRST_USER_ID + i
+        yield {"user_id": user_id, "first_name": FIRST_NAMES[i % len(FIRST_NAMES)],
+               "last_name": f"{LAST_NAMES[i % len(LAST_NAMES)]}{i}", "position": POSITIONS[i % len(POSITIONS)],
+               "department": DEPARTMENTS[i % len(DEPARTMENTS)], "email": f"user{user_id}@example.com"}
+
+
+def application_rows(rng, users, count, first_day):
+    # Заявки пользователя идут друг за другом без пересечений, как их допускает бот
+    next_start = {}
+    for i in range(count):
+        user_id = FIRST_USER_ID + i % users
+        start = next_start.get(user_id, first_day + timedelta(days=rng.randrange(30)))
+        end = start + timedelta(days=rng.randrange(14))
+        next_start[user_id] = end + timedelta(days=1 + rng.randrange(60))
+        created_at = datetime.combine(start, datetime.min.time()) - timedelta(days=rng.randrange(1, 30))
+        yield {"user_id": user_id, "start_date": start, "end_date": end, "type": rng.choice(APP_TYPES),
+               "status": rng.choice(STATUSES), "reason": f"Причина {i}", "created_at": created_at,
+               "updated_at": created_at}
+
+
+def log_rows(rng, users, count, days):
+    now = datetime.utcnow()
+    for i in range(count):
+        yield {"user_id": FIRST_USER_ID + rng.randrange(users), "action": f"{rng.choice(ACTIONS)} #{i}",
+               "timestamp": now - timedelta(seconds=rng.randrange(days * 86400))}
+
+
+def generate(main, users=1000, applications=20000, logs=100000, seed=1, log_days=30):
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    with main.engine.begin() as connection:
+        for batch in batches(user_rows(users)):
+            connection.execute(main.User.__table__.insert(), batch)
+        first_day = date(date.today().year - 3, 1, 1)
+        for batch in batches(application_rows(rng, users, applications, first_day)):
+            connection.execute(main.Application.__table__.insert(), batch)
+    # Записи лога раскладываются по суточным таблицам, как их пишет AuditLogWriter
+    for batch in batches(log_rows(rng, users, logs, log_days)):
+        by_day = {}
+        for row in batch:
+            by_day.setdefault(row["timestamp"].date(), []).append(row)
+        with main.engine.begin() as connection:
+            for day, rows in by_day.items():
+                table = main.log_partition(day)
+                table.create(connection, checkfirst=True)
+                connection.execute(table.insert(), rows)
+    with main.db_session() as session:
+        main.LeaveAggregates.rebuild(session)
+    return time.perf_counter() - started
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", default=f"sqlite:///{os.path.join(tempfile.gettempdir(), 'kusovaya_dataset.db')}")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--applications", type=int, default=20000)
+    parser.add_argument("--logs", type=int, default=100000)
+    parser.add_argument("--log-days", type=int, default=30, help="за сколько последних дней записи лога")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ.setdefault("TELEGRAM_TOKEN", "1:bench")
+    os.environ["DB_URL"] = args.db_url
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    import main
+
+    main.migrate(main.engine)
+    elapsed = generate(main, args.users, args.applications, args.logs, args.seed, args.log_days)
+    print(f"{args.users} пользователей, {args.applications} заявок, {args.logs} записей лога за {elapsed:.1f} с -> {args.db_url}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,338 @@
+# Сквозной нагрузочный тест: синтетические данные (dataset.py), локальный Bot API (fake_telegram.py)
+# и параллельные сценарии диалогов - регистрация, отпуск, больничный, рассмотрение заявок HR, отчеты, поиск.
+# Для каждого сценария выводит пропускную способность, задержку p50/p99 и число SQL-запросов на обновление,
+# а также время холодного старта отдельного процесса: импорт main, create_app() и первый PDF.
+# --output сохраняет результат в JSON, --baseline сравнивает с сохраненным и завершается с кодом 1 при регрессии
+# Запуск: python benchmarks/e2e.py [--users 1000] [--applications 20000] [--logs 100000] [--conversations 200]
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+import dataset  # noqa: E402
+from fake_telegram import FakeTelegramServer  # noqa: E402
+
+HR_CHAT_ID = 1
+FIRST_CHAT_ID = 1000
+FLOWS = ["registration", "vacation", "sick_leave", "review", "reports", "report_build", "search"]
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+class Bench:
+    def __init__(self, main):
+        self.main = main
+        self.update_ids = itertools.count(1)
+        self.samples = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Запросы считаются в потоке обработчика; фоновые потоки (аудит-лог, outbox) не учитываются
+        engines = [main.engine] + ([main.replica_engine] if main.replica_engine is not None else [])
+        for engine in engines:
+            main.event.listen(engine, "before_cursor_execute", self._count_query)
+
+    def _count_query(self, *args):
+        self._local.queries = getattr(self._local, "queries", 0) + 1
+
+    def measure(self, flow, func, *args):
+        self._local.queries = 0
+        started = time.perf_counter()
+        try:
+            func(*args)
+        except Exception as e:
+            with self._lock:
+                self.errors[flow] = self.errors.get(flow, 0) + 1
+            print(f"{flow}: {type(e).__name__}: {e}", file=sys.stderr)
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.samples.setdefault(flow, []).append((latency, self._local.queries))
+
+    def process(self, flow, update):
+        update = self.main.telebot.types.Update.de_json(update)
+        self.measure(flow, self.main.bot.process_new_updates, [update])
+
+    def say(self, flow, chat_id, text):
+        update_id = next(self.update_ids)
+        message = {"message_id": update_id, "date": int(time.time()), "text": text,
+                   "chat": {"id": chat_id, "type": "private"},
+                   "from": {"id": chat_id, "is_bot": False, "first_name": "Сотрудник"}}
+        if text.startswith("/"):
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text)}]
+        self.process(flow, {"update_id": update_id, "message": message})
+
+    def press(self, flow, chat_id, data):
+        update_id = next(self.update_ids)
+        message = {"message_id": update_id, "date": int(time.time()), "text": "Заявки",
+                   "chat": {"id": chat_id, "type": "private"}}
+        self.process(flow, {"update_id": update_id, "callback_query": {
+            "id": str(update_id), "chat_instance": str(chat_id), "data": data, "message": message,
+            "from": {"id": chat_id, "is_bot": False, "first_name": "HR"}}})
+
+
+def future_period(index, length):
+    # Периоды разных прогонов одного чата не пересекаются
+    start = date(date.today().year + 5, 1, 1) + timedelta(days=20 * index)
+    return str(start), str(start + timedelta(days=length))
+
+
+def registration(bench, chat_id):
+    for text in ["/start", "Имя", "Фамилия", "инженер", "ИТ", f"bench{chat_id}@example.com"]:
+        bench.say("registration", chat_id, text)
+
+
+def vacation(bench, chat_id, index):
+    start, end = future_period(index, 7)
+    for text in ["🏖️ Отпуск", "🌴 Ежегодный основной оплачиваемый", start, end, "Отпуск"]:
+        bench.say("vacation", chat_id, text)
+
+
+def sick_leave(bench, chat_id, index):
+    start, end = future_period(index, 3)
+    for text in ["🤒 Больничный", start, end, "Больничный"]:
+        bench.say("sick_leave", chat_id, text)
+
+
+def review(bench, app_id):
+    router = bench.main.router
+    bench.say("review", HR_CHAT_ID, "📋 Просмотр заявок")
+    bench.press("review", HR_CHAT_ID, router.callback_data("review", app_id))
+    bench.press("review", HR_CHAT_ID, router.callback_data("approve", app_id))
+
+
+def reports(bench, round_index, user_id):
+    # Шаги отчетов идут в одном чате HR, поэтому сценарий последовательный; построение PDF - в процессах ReportJobs
+    year = date.today().year - 1 - round_index % 2
+    # Конец периода бот принимает только не в прошлом
+    for text in ["📊 Отчет", "📅 Заявки за период", f"{year}-01-01", str(date.today() + timedelta(days=1)),
+                 "⏳ Длительность по отделам", str(year), "По типам и статусам", "📜 Logs", "👤 Заявки сотрудника"]:
+        bench.say("reports", HR_CHAT_ID, text)
+    bench.press("reports", HR_CHAT_ID, bench.main.router.callback_data("emp_report", user_id))
+
+
+def report_build(bench, round_index, user_id):
+    # Построение отчетов в текущем процессе, без кэша: время и запросы самих build_*
+    main = bench.main
+    year = date.today().year - 1 - round_index % 2
+    start = main.datetime(year, 1, 1)
+    end = main.datetime.combine(date.today() + timedelta(days=1), main.datetime.min.time())
+    now = main.datetime.utcnow()
+    for build, args in [(main.build_applications_report, (start, end)),
+                        (main.build_logs_report, (now - timedelta(hours=24), now)),
+                        (main.build_duration_report, (year,)),
+                        (main.build_employee_report, (user_id,))]:
+        bench.measure("report_build", build, *args)
+
+
+def search(bench, round_index):
+    # Фамилия, префиксы имени и фамилии, часть email, отдел и слова причины; кнопка и команда /search
+    user_id = dataset.FIRST_USER_ID + round_index
+    last_name = dataset.LAST_NAMES[round_index % len(dataset.LAST_NAMES)]
+    for text in [f"/search {last_name}{round_index}", f"/search {dataset.FIRST_NAMES[round_index % len(dataset.FIRST_NAMES)][:3]} {last_name[:3]}",
+                 f"/search user{user_id}@example", "🔎 Поиск", dataset.DEPARTMENTS[round_index % len(dataset.DEPARTMENTS)],
+                 "🔎 Поиск", f"Причина {round_index}"]:
+        bench.say("search", HR_CHAT_ID, text)
+
+
+COLD_START = """
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+main.create_app()
+ready = time.perf_counter()
+main.generate_pdf_report("Холодный старт", ["строка"])
+first_pdf = time.perf_counter()
+main.outbox_dispatcher.stop()
+main.audit_log.stop()
+print(json.dumps({"import": imported - started, "create_app": ready - imported, "first_pdf": first_pdf - ready,
+                  "phases": main.startup_timings}))
+"""
+
+
+def measure_cold_start(runs):
+    # Медиана по запускам; process - от запуска интерпретатора до готовности бота и первого PDF
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", COLD_START], cwd=ROOT, env=os.environ, check=True,
+                                capture_output=True, text=True).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        sample["process"] = time.perf_counter() - started
+        samples.append(sample)
+    samples.sort(key=lambda sample: sample["process"])
+    return samples[len(samples) // 2]
+
+
+def run_phase(bench, scripts, concurrency):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(script, *args) for script, *args in scripts]:
+            future.result()
+    return time.perf_counter() - started
+
+
+def wait_idle(main, timeout=120):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if not main.report_jobs.active() and not main.outbound_queue.stats()["depth"]:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def summarize(bench, flow, elapsed, conversations):
+    samples = bench.samples.get(flow, [])
+    latencies = [latency for latency, _ in samples]
+    queries = sum(count for _, count in samples)
+    return {"conversations": conversations, "updates": len(samples), "errors": bench.errors.get(flow, 0),
+            "elapsed": elapsed, "throughput": len(samples) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 0.5) * 1000, "p99_ms": percentile(latencies, 0.99) * 1000,
+            "queries_per_update": queries / len(samples) if samples else 0.0}
+
+
+def compare(results, baseline, tolerance):
+    # Регрессия: p99 или холодный старт выросли больше допуска, стало больше запросов на обновление или ошибок
+    regressions = []
+    # Прогоны с разным хранилищем состояния не сравниваются: у них разное число запросов на обновление
+    backend, base_backend = results["config"]["state_backend"], baseline.get("config", {}).get("state_backend")
+    if base_backend and backend != base_backend:
+        return [f"хранилище состояния {base_backend} в базовом прогоне, {backend} в текущем - сравнение невозможно"]
+    cold_start, base_cold_start = results.get("cold_start"), baseline.get("cold_start")
+    if cold_start and base_cold_start and cold_start["process"] > base_cold_start["process"] * (1 + tolerance):
+        regressions.append(f"холодный старт: {base_cold_start['process']:.2f} -> {cold_start['process']:.2f} с")
+    for flow, result in results.items():
+        base = baseline.get(flow)
+        if flow in ("cold_start", "config") or base is None:
+            continue
+        if result["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            regressions.append(f"{flow}: p99 {base['p99_ms']:.1f} -> {result['p99_ms']:.1f} мс")
+        # Сброс аудит-лога в обработчике зависит от времени, поэтому допускается лишний запрос на 10 обновлений
+        if result["queries_per_update"] > base["queries_per_update"] + 0.1:
+            regressions.append(f"{flow}: запросов на обновление {base['queries_per_update']:.2f} -> {result['queries_per_update']:.2f}")
+        if result["errors"] > base["errors"]:
+            regressions.append(f"{flow}: ошибок {base['errors']} -> {result['errors']}")
+    return regressions
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db-url", help="по умолчанию - новая SQLite во временном каталоге")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--applications", type=int, default=20000)
+    parser.add_argument("--logs", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--conversations", type=int, default=200, help="диалогов на сценарий")
+    parser.add_argument("--concurrency", type=int, default=16, help="одновременных диалогов")
+    parser.add_argument("--report-rounds", type=int, default=5)
+    parser.add_argument("--search-rounds", type=int, default=50)
+    parser.add_argument("--flows", nargs="+", choices=FLOWS, default=FLOWS)
+    parser.add_argument("--state-backend", choices=["memory", "database"],
+                        help="по умолчанию - настроенное в приложении (STATE_BACKEND)")
+    parser.add_argument("--cold-start-runs", type=int, default=3, help="запусков для замера холодного старта (0 - без замера)")
+    parser.add_argument("--api-latency", type=float, default=0.0, help="задержка фейкового Bot API, с")
+    parser.add_argument("--output", help="сохранить результат в JSON")
+    parser.add_argument("--baseline", help="JSON предыдущего прогона для сравнения")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="допустимый рост p99")
+    args = parser.parse_args()
+
+    fake_api = FakeTelegramServer(latency=args.api_latency).start()
+    db_url = args.db_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='kusovaya_e2e_'), 'e2e.db')}"
+    os.environ.update({"TELEGRAM_TOKEN": "1:bench", "HR_CHAT_ID": str(HR_CHAT_ID), "DB_URL": db_url,
+                       "TELEGRAM_API_URL": fake_api.api_url, "SEND_GLOBAL_RATE": "100000", "SEND_GLOBAL_BURST": "100000"})
+    if args.state_backend:
+        os.environ["STATE_BACKEND"] = args.state_backend
+    import main
+
+    # Обработка обновлений - в потоке сценария, отправка - через очередь без лимитов Telegram
+    main.bot.threaded = False
+    main.outbound_queue.chat_rate = main.outbound_queue.chat_burst = 100000
+    main.migrate(main.engine)
+    seed_time = dataset.generate(main, args.users, args.applications, args.logs, args.seed)
+    print(f"данные: {args.users} пользователей, {args.applications} заявок, {args.logs} записей лога за {seed_time:.1f} с ({db_url}), "
+          f"состояние диалогов: {main.CONFIG['STATE_BACKEND']}")
+    results = {"config": {"state_backend": main.CONFIG["STATE_BACKEND"]}}
+    if args.cold_start_runs:
+        cold_start = results["cold_start"] = measure_cold_start(args.cold_start_runs)
+        phases = ", ".join(f"{name} {seconds * 1000:.0f}" for name, seconds in cold_start["phases"].items())
+        print(f"холодный старт: {cold_start['process']:.2f} с до готовности и первого PDF; импорт {cold_start['import'] * 1000:.0f} мс, "
+              f"create_app {cold_start['create_app'] * 1000:.0f} мс ({phases}), первый PDF {cold_start['first_pdf'] * 1000:.0f} мс")
+    main.create_app()
+
+    with main.db_session() as session:
+        pending = [row.application_id for row in session.query(main.Application.application_id)
+                   .filter(main.Application.status == main.PENDING_STATUS)
+                   .order_by(main.Application.application_id).limit(args.conversations)]
+    chats = range(FIRST_CHAT_ID, FIRST_CHAT_ID + args.conversations)
+    dataset_users = [dataset.FIRST_USER_ID + i % args.users for i in range(args.report_rounds)]
+    phases = {
+        "registration": lambda: [(registration, bench, chat_id) for chat_id in chats],
+        "vacation": lambda: [(vacation, bench, chat_id, 0) for chat_id in chats],
+        "sick_leave": lambda: [(sick_leave, bench, chat_id, 1) for chat_id in chats],
+        "review": lambda: [(review, bench, app_id) for app_id in pending],
+        "reports": lambda: [(lambda: [reports(bench, i, user_id) for i, user_id in enumerate(dataset_users)],)],
+        "report_build": lambda: [(lambda: [report_build(bench, i, user_id) for i, user_id in enumerate(dataset_users)],)],
+        "search": lambda: [(lambda: [search(bench, i) for i in range(args.search_rounds)],)],
+    }
+    bench = Bench(main)
+    try:
+        for flow in FLOWS:
+            if flow not in args.flows:
+                continue
+            scripts = phases[flow]()
+            elapsed = run_phase(bench, scripts, args.concurrency)
+            results[flow] = summarize(bench, flow, elapsed, len(scripts))
+        if not wait_idle(main):
+            print("очередь отправки или отчеты не завершились за 120 с", file=sys.stderr)
+        main.audit_log.flush()
+
+        print(f"{'сценарий':<14} {'диалогов':>8} {'обновл.':>8} {'ошибок':>7} {'обн./с':>9} {'p50, мс':>9} {'p99, мс':>9} {'SQL/обн.':>9}")
+        for flow, result in results.items():
+            if flow in ("cold_start", "config"):
+                continue
+            print(f"{flow:<14} {result['conversations']:>8} {result['updates']:>8} {result['errors']:>7} {result['throughput']:>9.1f} "
+                  f"{result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} {result['queries_per_update']:>9.2f}")
+        with main.db_session() as session:
+            registered = session.query(main.User).filter(main.User.user_id.in_(chats)).count()
+            created = session.query(main.Application).filter(main.Application.user_id.in_(chats)).count()
+            approved = session.query(main.Application).filter(main.Application.application_id.in_(pending),
+                                                              main.Application.status == "одобрена").count()
+        print(f"проверка: зарегистрировано {registered}, создано заявок {created}, одобрено {approved} из {len(pending)}, "
+              f"вызовов Bot API {fake_api.total_calls()} {dict(sorted(fake_api.calls.items()))}")
+    finally:
+        main.outbox_dispatcher.stop()
+        main.audit_log.stop()
+        main.report_jobs.shutdown()
+        fake_api.stop()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"РЕГРЕССИЯ {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
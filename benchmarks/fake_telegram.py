@@ -0,0 +1,123 @@
+# Локальная замена Telegram Bot API для нагрузочных тестов: отвечает на вызовы бота
+# правдоподобными ответами, считает вызовы по методам и может имитировать задержку сети.
+# Файлы, добавленные через add_file, отдаются getFile и по адресу file_url
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+MULTIPART_CHAT_ID = re.compile(rb'name="chat_id"\r\n\r\n([^\r]+)')
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class FakeTelegramServer:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0):
+        self.latency = latency
+        self.calls = {}
+        self.files = {}
+        self._lock = threading.Lock()
+        self._message_ids = itertools.count(1)
+        self._server = _Server((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def api_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/bot{{0}}/{{1}}"
+
+    @property
+    def file_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/file/bot{{0}}/{{1}}"
+
+    def add_file(self, file_id, content):
+        self.files[file_id] = content
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-telegram", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def total_calls(self):
+        with self._lock:
+            return sum(self.calls.values())
+
+    def _record(self, method):
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+    def _result(self, method, params, body):
+        chat_id = params.get("chat_id")
+        if chat_id is None:
+            match = MULTIPART_CHAT_ID.search(body)
+            chat_id = match.group(1).decode() if match else "0"
+        message = {"message_id": next(self._message_ids), "date": int(time.time()),
+                   "chat": {"id": int(chat_id) if chat_id.lstrip("-").isdigit() else 0, "type": "private"}}
+        if method == "sendMessage":
+            message["text"] = params.get("text", "")
+            return message
+        if method == "sendDocument":
+            file_id = f"fake-file-{message['message_id']}"
+            message["document"] = {"file_id": file_id, "file_unique_id": file_id}
+            return message
+        if method == "getFile":
+            file_id = params.get("file_id", "")
+            return {"file_id": file_id, "file_unique_id": file_id, "file_size": len(self.files.get(file_id, b"")),
+                    "file_path": f"documents/{file_id}"}
+        if method == "getMe":
+            return {"id": 1, "is_bot": True, "first_name": "bench", "username": "bench_bot"}
+        return True
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело уходят одним пакетом, иначе клиент ждет delayed ACK (~40 мс на вызов)
+            wbufsize = 64 * 1024
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                url = urlsplit(self.path)
+                method = url.path.rsplit("/", 1)[-1]
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0) or 0))
+                if url.path.startswith("/file/"):
+                    return self._send_file(server.files.get(method))
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                if self.headers.get("Content-Type", "").startswith("application/x-www-form-urlencoded"):
+                    params.update({key: values[0] for key, values in parse_qs(body.decode()).items()})
+                server._record(method)
+                if server.latency:
+                    time.sleep(server.latency)
+                payload = json.dumps({"ok": True, "result": server._result(method, params, body)}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_file(self, content):
+                server._record("file")
+                self.send_response(200 if content is not None else 404)
+                self.send_header("Content-Length", str(len(content or b"")))
+                self.end_headers()
+                self.wfile.write(content or b"")
+
+            do_GET = _handle
+            do_POST = _handle
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,69 @@
+# Время верстки и размер PDF отчета по заявкам: весь документ сразу и потоковая верстка
+# Запуск: python benchmarks/pdf_render.py [--sizes 1000 10000 50000]
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("TELEGRAM_TOKEN", "1:bench")
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'kusovaya_bench.db')}")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import main  # noqa: E402
+
+APP_TYPES = ["ежегодный основной оплачиваемый", "ежегодный дополнительный оплачиваемый",
+             "без сохранения заработной платы", "больничный"]
+STATUSES = ["на рассмотрении", "одобрена", "отклонена"]
+
+
+def synthetic_rows(count):
+    start = date(2025, 1, 1)
+    for i in range(count):
+        app_start = start + timedelta(days=i % 365)
+        yield (i + 1, f"Сотрудник{i % 500} Фамилия{i % 37}", APP_TYPES[i % len(APP_TYPES)],
+               app_start, app_start + timedelta(days=i % 14), STATUSES[i % len(STATUSES)])
+
+
+def report_lines(count):
+    return (f"#{app_id} - {name} ({app_type}, {start} - {end}) - {status}"
+            for app_id, name, app_type, start, end, status in synthetic_rows(count))
+
+
+def render_paragraphs(count):
+    return main.generate_pdf_report("Отчет по заявкам", list(report_lines(count)))
+
+
+def render_streaming(count):
+    return main.generate_pdf_report_streaming("Отчет по заявкам", report_lines(count))
+
+
+def measure(render, count):
+    started = time.perf_counter()
+    buffer = render(count)
+    elapsed = time.perf_counter() - started
+    buffer.seek(0, os.SEEK_END)
+    size = buffer.tell()
+    buffer.close()
+    return elapsed, size
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+    # Прогрев: стили и шрифты строятся один раз на процесс и не должны попадать в замер
+    measure(render_paragraphs, 10)
+    measure(render_streaming, 10)
+    print(f"{'rows':>8} {'renderer':>11} {'seconds':>9} {'bytes':>11}")
+    for count in args.sizes:
+        for name, render in (("paragraphs", render_paragraphs), ("streaming", render_streaming)):
+            elapsed, size = measure(render, count)
+            print(f"{count:>8} {name:>11} {elapsed:>9.2f} {size:>11}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,81 @@
+# Стоимость выбора обработчика: словарь Router против цепочки фильтров-лямбд, как у обработчиков telebot
+# Запуск: python benchmarks/router_dispatch.py [--routes 10 100 1000 10000] [--iterations 200000]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("TELEGRAM_TOKEN", "1:bench")
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(tempfile.gettempdir(), 'kusovaya_bench.db')}")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import telebot  # noqa: E402
+import main  # noqa: E402
+
+
+def make_message(text):
+    return telebot.types.Message.de_json({"message_id": 1, "date": 0, "text": text,
+                                          "chat": {"id": 1, "type": "private"}})
+
+
+def build_router(count):
+    router = main.Router()
+    for i in range(count):
+        router.text(f"Кнопка {i}")(lambda message: None)
+        router.callback(f"action{i}", int, main.page_direction)(lambda call, key, direction: None)
+    return router
+
+
+def build_chain(count):
+    # Как раньше: список (фильтр, обработчик), фильтры проверяются по порядку, данные разбираются split
+    texts = [(lambda m, text=f"Кнопка {i}": m.text == text) for i in range(count)]
+    callbacks = [(lambda data, prefix=f"action{i}_": data.startswith(prefix)) for i in range(count)]
+    return texts, callbacks
+
+
+def per_call(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--routes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'маршрутов':>10} {'текст, Router':>15} {'текст, цепочка':>15} {'callback, Router':>17} {'callback, цепочка':>18}")
+    for count in args.routes:
+        router = build_router(count)
+        texts, callbacks = build_chain(count)
+        # Худший случай для цепочки: совпадает последний маршрут
+        message = make_message(f"Кнопка {count - 1}")
+        data = router.callback_data(f"action{count - 1}", 42, "n")
+        legacy_data = f"action{count - 1}_42_n"
+        iterations = max(1000, args.iterations // max(1, count // 100))
+
+        def chain_text():
+            for matches in texts:
+                if matches(message):
+                    return matches
+
+        def chain_callback():
+            for matches in callbacks:
+                if matches(legacy_data):
+                    _, key, direction = legacy_data.rsplit("_", 2)
+                    return int(key), direction
+
+        router_text = per_call(lambda: router.route_message(message), args.iterations)
+        router_callback = per_call(lambda: router.parse_callback(data), args.iterations)
+        linear_text = per_call(chain_text, iterations)
+        linear_callback = per_call(chain_callback, iterations)
+        print(f"{count:>10} {router_text:>12.0f} нс {linear_text:>12.0f} нс {router_callback:>14.0f} нс {linear_callback:>15.0f} нс")
+
+
+if __name__ == "__main__":
+    main_cli()
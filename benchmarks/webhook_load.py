@@ -0,0 +1,104 @@
+# Нагрузочный тест webhook-режима: поток обновлений от многих чатов на локальный webhook,
+# ответы Bot API отдает FakeTelegramServer. Выводит пропускную способность и задержку обработчиков
+# Запуск: python benchmarks/webhook_load.py [--rate 300] [--duration 10] [--chats 500]
+import argparse
+import itertools
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+from fake_telegram import FakeTelegramServer  # noqa: E402
+
+MENU_TEXTS = ["🏖️ Отпуск", "🏠 В главное меню", "/start", "🤒 Больничный", "🏠 В главное меню"]
+
+
+def make_update(update_id, chat_id, text):
+    message = {"message_id": update_id, "date": int(time.time()), "text": text,
+               "chat": {"id": chat_id, "type": "private"},
+               "from": {"id": chat_id, "is_bot": False, "first_name": "Сотрудник"}}
+    if text.startswith("/"):
+        message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text)}]
+    return {"update_id": update_id, "message": message}
+
+
+def main_cli():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rate", type=int, default=300, help="обновлений в секунду")
+    parser.add_argument("--duration", type=float, default=10, help="длительность, с")
+    parser.add_argument("--chats", type=int, default=500)
+    parser.add_argument("--api-latency", type=float, default=0.02, help="задержка фейкового Bot API, с")
+    parser.add_argument("--api-rate", type=float, default=100000,
+                        help="общий лимит отправки, сообщений/с (30 - как у настоящего Telegram)")
+    parser.add_argument("--send-workers", type=int, default=16, help="потоков отправки в Bot API")
+    args = parser.parse_args()
+
+    fake_api = FakeTelegramServer(latency=args.api_latency).start()
+    db_path = os.path.join(tempfile.mkdtemp(prefix="kusovaya_load_"), "load.db")
+    os.environ.update({"TELEGRAM_TOKEN": "1:bench", "HR_CHAT_ID": "1", "DB_URL": f"sqlite:///{db_path}",
+                       "TELEGRAM_API_URL": fake_api.api_url, "STATE_BACKEND": "memory", "WEBHOOK_PORT": "0",
+                       "SEND_GLOBAL_RATE": str(args.api_rate), "SEND_GLOBAL_BURST": str(args.api_rate), "SEND_WORKERS": str(args.send_workers)})
+    import main
+
+    main.migrate(main.engine)
+    with main.db_session() as session:
+        for chat_id in range(1000, 1000 + args.chats):
+            session.add(main.User(user_id=chat_id, first_name="Имя", last_name="Фамилия",
+                                  department=f"Отдел {chat_id % 10}", email=f"user{chat_id}@example.com"))
+
+    server = main.create_webhook_server()
+    threading.Thread(target=server.serve_forever, name="webhook", daemon=True).start()
+    host, port = server.server_address[:2]
+    url = f"http://{host}:{port}{main.CONFIG['WEBHOOK_PATH']}"
+
+    def post(update):
+        request = urllib.request.Request(url, data=json.dumps(update).encode(), method="POST",
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except OSError as e:
+            return type(e).__name__
+
+    total = int(args.rate * args.duration)
+    texts = itertools.cycle(MENU_TEXTS)
+    statuses = {}
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=32) as posters:
+        futures = []
+        for i in range(total):
+            # Равномерная подача с заданной частотой
+            delay = started + i / args.rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            chat_id = 1000 + i % args.chats
+            futures.append(posters.submit(post, make_update(i + 1, chat_id, next(texts))))
+        for future in futures:
+            status = future.result()
+            statuses[status] = statuses.get(status, 0) + 1
+    while main.update_dispatcher.stats()["pending"]:
+        time.sleep(0.05)
+    elapsed = time.perf_counter() - started
+
+    stats = main.update_dispatcher.stats()
+    print(f"updates: {total}, http statuses: {statuses}")
+    print(f"throughput: {stats['processed'] / elapsed:.1f} updates/s over {elapsed:.1f} s")
+    print(f"handler latency p50: {stats['latency_p50'] * 1000:.1f} ms, p99: {stats['latency_p99'] * 1000:.1f} ms")
+    print(f"errors: {stats['errors']}, rejected: {stats['rejected']}, Bot API calls: {fake_api.total_calls()}")
+    server.shutdown()
+    fake_api.stop()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,89 @@
+# Тесты работают с отдельной SQLite во временном каталоге: переменные окружения задаются до импорта main
+import os
+import sys
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_DIR = tempfile.mkdtemp(prefix="kusovaya_tests_")
+os.environ.update({"TELEGRAM_TOKEN": "1:test", "HR_CHAT_ID": "1", "STATE_BACKEND": "memory",
+                   "DB_URL": f"sqlite:///{os.path.join(DB_DIR, 'tests.db')}"})
+os.environ.pop("DB_REPLICA_URL", None)
+sys.path.insert(0, ROOT)
+# Шрифт для PDF ищется относительно корня репозитория
+os.chdir(ROOT)
+
+FIRST_USER_ID = 1000
+
+
+@pytest.fixture(scope="session")
+def main():
+    import main
+    main.migrate(main.engine)
+    yield main
+    main.audit_log.stop()
+    main.outbox_dispatcher.stop()
+    main.report_jobs.shutdown()
+
+
+@pytest.fixture(scope="session")
+def seed(main):
+    # seed(count) добавляет count пользователей, по заявке каждому, count заявок первому пользователю
+    # и count записей лога за последний час
+    added = {"users": 0}
+
+    def add(count):
+        today = date.today()
+        first = FIRST_USER_ID + added["users"]
+        users = [{"user_id": first + i, "first_name": "Имя", "last_name": f"Фамилия{first + i}", "position": "инженер",
+                  "department": f"Отдел {i % 3}", "email": f"user{first + i}@example.com"} for i in range(count)]
+        applications = [{"user_id": user["user_id"], "start_date": today, "end_date": today, "type": "больничный",
+                         "status": main.PENDING_STATUS, "reason": "Причина"} for user in users]
+        applications += [{"user_id": FIRST_USER_ID, "start_date": today, "end_date": today, "type": "больничный",
+                          "status": "одобрена", "reason": "Причина"} for _ in range(count)]
+        now = datetime.utcnow()
+        logs = [{"user_id": user["user_id"], "action": "Запись", "timestamp": now - timedelta(minutes=1)} for user in users]
+        with main.engine.begin() as connection:
+            connection.execute(main.User.__table__.insert(), users)
+            connection.execute(main.Application.__table__.insert(), applications)
+            partition = main.log_partition(now.date())
+            partition.create(connection, checkfirst=True)
+            connection.execute(partition.insert(), logs)
+        with main.db_session() as session:
+            main.LeaveAggregates.rebuild(session)
+        added["users"] += count
+
+    return add
+
+
+class StatementCounter:
+    # Запросы, выполненные в текущем потоке: фоновые потоки (аудит-лог, outbox) не учитываются
+    def __init__(self, engine):
+        self.engine = engine
+        self.thread = threading.get_ident()
+        self.count = 0
+
+    def _count(self, *args):
+        if threading.get_ident() == self.thread:
+            self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+
+@pytest.fixture
+def count_statements(main):
+    # (результат, число запросов)
+    def count(func, *args):
+        with StatementCounter(main.engine) as counter:
+            result = func(*args)
+        return result, counter.count
+    return count
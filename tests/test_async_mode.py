@@ -0,0 +1,108 @@
+# BOT_MODE=async: диалоги регистрации и подачи заявки, рассмотрение заявки HR и импорт сотрудников
+# обрабатываются корутинами, без пула потоков диспетчера; Bot API - локальная замена
+import asyncio
+import itertools
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from fake_telegram import FakeTelegramServer  # noqa: E402
+
+USER_CHAT_ID = 9001
+update_ids = itertools.count(1)
+
+
+@pytest.fixture
+def telegram(main, monkeypatch):
+    import telebot.asyncio_helper
+    server = FakeTelegramServer().start()
+    monkeypatch.setattr(main.telebot.apihelper, "API_URL", server.api_url)
+    monkeypatch.setattr(main.telebot.apihelper, "FILE_URL", server.file_url)
+    monkeypatch.setattr(telebot.asyncio_helper, "API_URL", server.api_url)
+    # Лимит Telegram на чат (1 сообщение в секунду) растянул бы сценарий на десятки секунд
+    monkeypatch.setattr(main, "outbound_queue", main.OutboundQueue(10000, 10000, 10000, 10000, 1))
+    yield server
+    server.stop()
+
+
+def message_update(chat_id, text=None, document=None):
+    update_id = next(update_ids)
+    message = {"message_id": update_id, "date": int(time.time()), "chat": {"id": chat_id, "type": "private"},
+               "from": {"id": chat_id, "is_bot": False, "first_name": "Сотрудник"}}
+    if document is not None:
+        message["document"] = document
+    else:
+        message["text"] = text
+        if text.startswith("/"):
+            message["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text)}]
+    return {"update_id": update_id, "message": message}
+
+
+def callback_update(chat_id, data):
+    update_id = next(update_ids)
+    message = {"message_id": update_id, "date": int(time.time()), "text": "Заявки", "chat": {"id": chat_id, "type": "private"}}
+    return {"update_id": update_id, "callback_query": {"id": str(update_id), "chat_instance": str(chat_id), "data": data,
+                                                       "message": message, "from": {"id": chat_id, "is_bot": False, "first_name": "HR"}}}
+
+
+async def process(main, updates):
+    # Обновления одного этапа; диспетчер дожидается их обработки при остановке
+    dispatcher = main.AsyncUpdateDispatcher(100, 2)
+    for update in updates:
+        await dispatcher.submit(main.telebot.types.Update.de_json(update))
+    await dispatcher.shutdown()
+    assert (dispatcher.errors, dispatcher.in_threads) == (0, 0)
+    return dispatcher.processed
+
+
+def application_status(main, app_id):
+    with main.db_session() as session:
+        return session.get(main.Application, app_id).status
+
+
+def test_async_conversations(main, telegram, monkeypatch):
+    from telebot.async_telebot import AsyncTeleBot
+    hr_chat_id = int(main.CONFIG["HR_CHAT_ID"])
+    router = main.router
+    start = date(date.today().year + 5, 3, 1)
+
+    async def scenario():
+        main.init_async_engine()
+        monkeypatch.setattr(main, "async_bot", AsyncTeleBot(main.CONFIG["TELEGRAM_TOKEN"]))
+        try:
+            texts = ["/start", "Имя", "Фамилия", "инженер", "ИТ", f"async{USER_CHAT_ID}@example.com",
+                     "🏖️ Отпуск", "🌴 Ежегодный основной оплачиваемый", str(start), str(start + timedelta(days=7)), "Отпуск",
+                     "🤒 Больничный", str(start + timedelta(days=30)), str(start + timedelta(days=32)), "Больничный"]
+            assert await process(main, [message_update(USER_CHAT_ID, text) for text in texts]) == len(texts)
+            with main.db_session() as session:
+                department = session.get(main.User, USER_CHAT_ID).department
+                app_ids = [app.application_id for app in session.query(main.Application).filter_by(
+                    user_id=USER_CHAT_ID).order_by(main.Application.start_date)]
+            assert department == "ИТ" and len(app_ids) == 2
+
+            approved, rejected = app_ids
+            await process(main, [message_update(hr_chat_id, "📋 Просмотр заявок"),
+                                 callback_update(hr_chat_id, router.callback_data("review", approved)),
+                                 callback_update(hr_chat_id, router.callback_data("approve", approved)),
+                                 callback_update(hr_chat_id, router.callback_data("reject", rejected)),
+                                 message_update(hr_chat_id, "Нет замены")])
+            assert application_status(main, approved) == "одобрена"
+            assert application_status(main, rejected) == "отклонена"
+
+            telegram.add_file("async-import", "email,first_name,last_name,position,department\n"
+                                              "async-import@example.com,Имя,Фамилия,инженер,ИТ\n".encode())
+            await process(main, [message_update(hr_chat_id, document={"file_id": "async-import", "file_unique_id": "async-import",
+                                                                      "file_name": "staff.csv"})])
+            with main.db_session() as session:
+                assert session.get(main.Employee, "async-import@example.com") is not None
+        finally:
+            await main.async_bot.close_session()
+            await main.async_engine.dispose()
+
+    asyncio.run(scenario())
+    # Ответы отправлял асинхронный бот: регистрация, две заявки, рассмотрение и импорт
+    assert telegram.calls["sendMessage"] >= 20 and telegram.calls["file"] == 1
@@ -0,0 +1,61 @@
+# Импорт CSV из документа Telegram: файл скачивается с локальной замены Bot API
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+from fake_telegram import FakeTelegramServer  # noqa: E402
+
+HEADER = b"email,first_name,last_name,position,department\n"
+
+
+@pytest.fixture
+def telegram(main, monkeypatch):
+    server = FakeTelegramServer().start()
+    monkeypatch.setattr(main.telebot.apihelper, "API_URL", server.api_url)
+    monkeypatch.setattr(main.telebot.apihelper, "FILE_URL", server.file_url)
+    replies = []
+    monkeypatch.setattr(main, "send_message", lambda chat_id, text, *args, **kwargs: replies.append(text))
+    yield server, replies
+    server.stop()
+
+
+def upload(main, server, file_id, content):
+    server.add_file(file_id, content)
+    document = SimpleNamespace(file_id=file_id, file_name="staff.csv", file_size=None)
+    main.import_employees_document(SimpleNamespace(chat=SimpleNamespace(id=int(main.CONFIG["HR_CHAT_ID"])), document=document))
+
+
+def imported(main, prefix):
+    with main.db_session() as session:
+        return session.query(main.Employee).filter(main.Employee.email.like(f"{prefix}%")).count()
+
+
+def rows(prefix, count):
+    return b"".join(f"{prefix}{i}@example.com,Имя,Фамилия,инженер,Отдел\n".encode() for i in range(count))
+
+
+def test_import_document(main, telegram):
+    server, replies = telegram
+    upload(main, server, "valid", HEADER + rows("valid", 3))
+    assert imported(main, "valid") == 3
+    assert replies[-1].startswith("Импорт сотрудников: новых 3")
+
+
+def test_invalid_encoding_rejected_before_first_batch(main, telegram, monkeypatch):
+    server, replies = telegram
+    monkeypatch.setitem(main.CONFIG, "IMPORT_BATCH_SIZE", 10)
+    # Первые пачки корректны, байт не из UTF-8 только в конце файла
+    upload(main, server, "broken", HEADER + rows("broken", 25) + b"\xffbroken@example.com,A,B,C,D\n")
+    assert imported(main, "broken") == 0
+    assert replies == ["❌ Файл не в кодировке UTF-8"]
+
+
+def test_oversized_download_rejected(main, telegram, monkeypatch):
+    server, replies = telegram
+    monkeypatch.setitem(main.CONFIG, "IMPORT_MAX_BYTES", 100)
+    upload(main, server, "large", HEADER + rows("large", 10))
+    assert imported(main, "large") == 0
+    assert replies == ["❌ Файл слишком большой"]
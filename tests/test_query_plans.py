@@ -0,0 +1,13 @@
+# Запросы списков, отчетов, поиска и удаления читают applications и суточные таблицы лога по индексу
+# (та же проверка, что python main.py check-plans)
+
+
+def test_queries_use_indexes(main, seed):
+    # Данные нужны для суточной таблицы лога: ее запросы проверяются, только если она существует
+    seed(50)
+    results = main.check_query_plans()
+    names = [name for name, _, _ in results]
+    assert "Заявки за период" in names
+    assert any(name.startswith("Удаление логов пользователя") for name in names)
+    full_scans = {name: plan for name, uses_index, plan in results if not uses_index}
+    assert not full_scans
@@ -0,0 +1,61 @@
+# Чтение с реплики: метка replica_heartbeat на реплике задается в тесте, а не приходит с репликацией
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def replica(main, monkeypatch):
+    path = os.path.join(tempfile.mkdtemp(prefix="kusovaya_replica_"), "replica.db")
+    replica_engine = create_engine(f"sqlite:///{path}")
+    main.ReplicaHeartbeat.__table__.create(replica_engine)
+    monitor = main.ReplicaMonitor(main.engine, replica_engine, max_lag=30, check_interval=0)
+    monkeypatch.setattr(main, "replica_engine", replica_engine)
+    monkeypatch.setattr(main, "ReplicaSessionFactory", sessionmaker(bind=replica_engine))
+    monkeypatch.setattr(main, "replica_monitor", monitor)
+    yield replica_engine, monitor
+    replica_engine.dispose()
+
+
+def set_heartbeat(main, replica_engine, beat_at):
+    table = main.ReplicaHeartbeat.__table__
+    with replica_engine.begin() as connection:
+        connection.execute(table.delete())
+        connection.execute(table.insert().values(heartbeat_id=1, beat_at=beat_at))
+
+
+def read_bind(main):
+    with main.db_session(read_only=True) as session:
+        return session.get_bind()
+
+
+def test_fresh_replica_serves_reads(main, replica):
+    replica_engine, monitor = replica
+    set_heartbeat(main, replica_engine, datetime.utcnow())
+    assert read_bind(main) is replica_engine
+    assert (monitor.reads, monitor.fallbacks) == (1, 0)
+    # Запись всегда идет в основную БД
+    with main.db_session() as session:
+        assert session.get_bind() is main.engine
+
+
+def test_stale_replica_falls_back_to_primary(main, replica):
+    replica_engine, monitor = replica
+    set_heartbeat(main, replica_engine, datetime.utcnow() - timedelta(minutes=5))
+    assert read_bind(main) is main.engine
+    assert monitor.lag > monitor.max_lag
+    assert (monitor.reads, monitor.fallbacks) == (0, 1)
+    # Метка дошла до реплики: следующая проверка возвращает чтение на реплику
+    set_heartbeat(main, replica_engine, datetime.utcnow())
+    assert read_bind(main) is replica_engine
+
+
+def test_missing_heartbeat_falls_back_to_primary(main, replica):
+    # Таблица не реплицируется: метки на реплике нет
+    _, monitor = replica
+    assert read_bind(main) is main.engine
+    assert monitor.lag is None and monitor.fallbacks == 1
@@ -0,0 +1,35 @@
+# Версия данных кэша отчетов общая для процессов бота с общим хранилищем состояния
+import io
+from types import SimpleNamespace
+
+
+def report(content=b"%PDF"):
+    return io.BytesIO(content)
+
+
+def test_bump_in_other_process_invalidates_cached_report(main):
+    # Два процесса бота: у каждого свой кэш, хранилище состояния общее
+    store = main.DatabaseStateStore()
+    first = main.ReportCache(4, 1024, None, store)
+    second = main.ReportCache(4, 1024, None, store)
+    first.put("report", first.data_version, report(), "report.pdf")
+    assert first.get("report") is not None
+    second.bump_version()
+    assert first.get("report") is None
+
+
+def test_report_built_before_bump_is_not_cached(main):
+    cache = main.ReportCache(4, 1024, None, main.DatabaseStateStore())
+    version = cache.data_version
+    cache.bump_version()
+    cache.put("report", version, report(), "report.pdf", SimpleNamespace(document=None))
+    assert cache.get("report") is None
+
+
+def test_concurrent_increments_are_not_lost(main):
+    from concurrent.futures import ThreadPoolExecutor
+    store = main.DatabaseStateStore()
+    start = store.get(main.REPORT_VERSION_CHAT_ID, "test_counter") or 0
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(lambda _: store.increment(main.REPORT_VERSION_CHAT_ID, "test_counter"), range(20)))
+    assert store.get(main.REPORT_VERSION_CHAT_ID, "test_counter") == start + 20
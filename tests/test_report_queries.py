@@ -0,0 +1,41 @@
+# Число SQL-запросов каждого отчета не зависит от числа строк: данные читаются одной выборкой с JOIN
+# (потоково, пачками курсора), а не запросом на строку
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from conftest import FIRST_USER_ID
+
+# Запросы отчета: выборка данных плюс служебные (список суточных таблиц лога)
+REPORT_STATEMENTS = {
+    "applications": 1,
+    "logs": 2,
+    "duration": 1,
+    "employee": 1,
+}
+
+
+def report_call(main, name):
+    today = date.today()
+    now = datetime.utcnow()
+    return {
+        "applications": (main.build_applications_report, datetime(today.year, 1, 1), datetime(today.year, 12, 31)),
+        "logs": (main.build_logs_report, now - timedelta(hours=24), now),
+        "duration": (main.build_duration_report, today.year),
+        "employee": (main.build_employee_report, FIRST_USER_ID),
+    }[name]
+
+
+@pytest.mark.parametrize("name", sorted(REPORT_STATEMENTS))
+def test_report_statements_do_not_depend_on_rows(main, seed, count_statements, name):
+    counts = []
+    for rows in (5, 500):
+        seed(rows)
+        build, *args = report_call(main, name)
+        result, statements = count_statements(build, *args)
+        # Отчет построен по данным, а не ответ "нет данных"
+        assert result.filename is not None
+        os.remove(result.path)
+        counts.append(statements)
+    assert counts == [REPORT_STATEMENTS[name]] * 2